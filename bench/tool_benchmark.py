@@ -0,0 +1,559 @@
+# -*- coding: utf-8 -*-
+"""
+工具离线基准测试
+
+对每个工具的 execute() 在本地替身环境下运行，输出每个场景的
+墙钟时间、峰值RSS和启动的子进程数（JSON），并可与保存的基线比较：
+- convert_video：用 ffmpeg lavfi 生成的测试视频
+- get_weather / get_weather_forecast：本地HTTP桩替代 wttr.in
+- install_nerd_font：本地HTTP桩提供字体发布zip，HOME指向临时目录
+- git_code_stats：按月回溯提交的合成git仓库
+- nvim_diagnostic：伪造的nvim配置目录和插件目录
+
+--startup 模式改为测量加载全部工具（导入 + check()）的耗时，给出三组结果：
+legacy（重放改造前的模块顶层导入和 check() 子进程探测）、uncached（禁用探测缓存）
+和 cached（缓存命中）；任一组中出错的工具会从三组的合计中一并剔除。
+
+每个场景在独立子进程中运行，保证峰值RSS互不影响；缺少依赖的场景会被跳过。
+peak_rss_kb 是场景Python进程本身的峰值；subprocess_peak_rss_kb 是工具启动的
+各个命令（ffmpeg、git、loc等）中最大的峰值RSS。后者在Linux上以fork时继承的
+场景进程峰值为下限，命令本身占用更小时只反映该下限，但命令的内存增长仍会体现出来。
+本文件不放在工具目录中，避免jarvis加载工具时一并导入。
+
+用法:
+    python bench/tool_benchmark.py                       # 运行全部场景
+    python bench/tool_benchmark.py -s nvim_diagnostic    # 只运行指定场景
+    python bench/tool_benchmark.py --save-baseline base.json
+    python bench/tool_benchmark.py --baseline base.json --threshold 1.2
+    python bench/tool_benchmark.py --startup
+"""
+import argparse
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, TOOL_DIR)
+
+from tool_probe import CACHE_ENV, find_binary, probe_module
+from tool_runner import get_metrics, reset_metrics, run_command
+
+WTTR_URL = "https://wttr.in"
+NERD_FONT_URL = "https://github.com/ryanoasis/nerd-fonts/releases/download"
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 1.2
+DEFAULT_PLUGIN_COUNT = 150
+SCENARIO_TIMEOUT = 600
+STARTUP_TIMEOUT = 120
+
+TOOL_MODULES = [
+    "convert_video",
+    "get_weather",
+    "get_weather_forecast",
+    "git_code_stats",
+    "install_nerd_font",
+    "nvim_diagnostic",
+]
+
+# 改造前各工具加载时的开销：模块顶层导入的库，以及 check() 启动的命令
+LEGACY_STARTUP: Dict[str, Dict[str, List[Any]]] = {
+    "convert_video": {"imports": [], "commands": [["ffmpeg", "-version"]]},
+    "get_weather": {"imports": ["requests"], "commands": []},
+    "get_weather_forecast": {"imports": ["requests"], "commands": []},
+    "git_code_stats": {"imports": ["dateutil.relativedelta"],
+                       "commands": [["git", "--version"], ["loc", "--version"]]},
+    "install_nerd_font": {"imports": [],
+                          "commands": [["which", "wget"], ["which", "curl"], ["which", "fc-cache"]]},
+    "nvim_diagnostic": {"imports": [], "commands": [["nvim", "--version"]]},
+}
+
+_STARTUP_SCRIPT = """\
+import importlib, json, subprocess, sys, time
+sys.path.insert(0, sys.argv[1])
+legacy = json.loads(sys.argv[3]) if len(sys.argv) > 3 else None
+start = time.perf_counter()
+module = __import__(sys.argv[2])
+if legacy is not None:
+    for name in legacy["imports"]:
+        importlib.import_module(name)
+imported = time.perf_counter()
+if legacy is not None:
+    available = True
+    for command in legacy["commands"]:
+        try:
+            subprocess.run(command, capture_output=True, text=True)
+        except OSError:
+            available = False
+else:
+    available = getattr(module, sys.argv[2]).check()
+checked = time.perf_counter()
+print(json.dumps({'import_s': imported - start, 'check_s': checked - imported, 'available': available}))
+"""
+
+
+def _git(args: List[str], cwd: str, date: Optional[str] = None) -> None:
+    env = dict(os.environ)
+    env.update({
+        "GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@localhost",
+        "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@localhost",
+    })
+    if date:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = date
+    run_command(["git", *args], cwd=cwd, env=env, check=True, timeout=60)
+
+
+def _weather_payload() -> Dict[str, Any]:
+    """构造与 wttr.in ?format=j1 结构一致的数据"""
+    hourly = [
+        {"time": str(hour * 100), "tempC": "20", "windspeedKmph": "10",
+         "weatherDesc": [{"value": "Sunny"}]}
+        for hour in range(0, 24, 3)
+    ]
+    return {
+        "current_condition": [{
+            "temp_C": "21", "FeelsLikeC": "20", "windspeedKmph": "8", "humidity": "40",
+            "weatherDesc": [{"value": "Partly cloudy"}],
+        }],
+        "nearest_area": [{
+            "areaName": [{"value": "Bench"}], "country": [{"value": "Localhost"}],
+            "value": "Bench",
+        }],
+        "weather": [
+            {"date": f"2024-01-0{day + 1}", "maxtempC": "25", "mintempC": "12",
+             "astronomy": [{"sunrise": "06:30 AM", "sunset": "06:00 PM"}],
+             "hourly": hourly}
+            for day in range(3)
+        ],
+    }
+
+
+def _font_zip(font_name: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for style in ("Regular", "Bold", "Italic", "BoldItalic"):
+            zf.writestr(f"{font_name}NerdFont-{style}.ttf", b"\0" * 4096)
+        zf.writestr("README.md", "bench")
+    return buffer.getvalue()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """本地HTTP桩：.zip 路径返回字体包，其余路径返回天气JSON"""
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path.endswith(".zip"):
+            body = _font_zip(os.path.basename(path)[:-4])
+            content_type = "application/zip"
+        else:
+            body = json.dumps(_weather_payload()).encode("utf-8")
+            content_type = "application/json"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_stub() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _stub_url(server: ThreadingHTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ---------------------------------------------------------------- 场景准备
+
+def _prepare_convert_video(workdir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    input_file = os.path.join(workdir, "input.avi")
+    run_command([
+        "ffmpeg", "-y", "-f", "lavfi", "-i", "testsrc=duration=3:size=320x240:rate=25",
+        "-f", "lavfi", "-i", "sine=frequency=440:duration=3", input_file
+    ], check=True, timeout=120)
+    return {"input_file": input_file, "output_file": os.path.join(workdir, "output.mp4")}
+
+
+def _prepare_home(workdir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    home = os.path.join(workdir, "home")
+    os.makedirs(home, exist_ok=True)
+    return {"home": home}
+
+
+def _prepare_git_code_stats(workdir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    repo = os.path.join(workdir, "repo")
+    os.makedirs(repo)
+    _git(["init", "-q", "-b", "main"], cwd=repo)
+    for month in range(1, 13):
+        with open(os.path.join(repo, f"module_{month:02d}.py"), "w", encoding="utf-8") as f:
+            for i in range(200):
+                f.write(f"def func_{month}_{i}():\n    return {i}\n\n")
+        _git(["add", "."], cwd=repo)
+        _git(["commit", "-q", "-m", f"month {month}"], cwd=repo, date=f"2023-{month:02d}-15T12:00:00")
+    return {"repo": repo}
+
+
+def _prepare_nvim_diagnostic(workdir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    home = os.path.join(workdir, "home")
+    upstream = os.path.join(workdir, "upstream")
+    plugged = os.path.join(home, ".local", "share", "nvim", "plugged")
+    autoload = os.path.join(home, ".local", "share", "nvim", "site", "autoload")
+    config_dir = os.path.join(home, ".config", "nvim")
+    for path in (upstream, plugged, autoload, config_dir):
+        os.makedirs(path, exist_ok=True)
+    with open(os.path.join(autoload, "plug.vim"), "w", encoding="utf-8") as f:
+        f.write(
+            '" vim-plug stand-in\n'
+            "function! plug#begin(...) abort\n"
+            "  command! -nargs=+ -bar Plug call plug#noop(<args>)\n"
+            "endfunction\n"
+            "function! plug#noop(...) abort\n"
+            "endfunction\n"
+            "function! plug#end() abort\n"
+            "endfunction\n"
+        )
+
+    _git(["init", "-q", "-b", "master"], cwd=upstream)
+    for i in range(3):
+        with open(os.path.join(upstream, f"plugin_{i}.vim"), "w", encoding="utf-8") as f:
+            f.write(f'" revision {i}\n')
+        _git(["add", "."], cwd=upstream)
+        _git(["commit", "-q", "-m", f"revision {i}"], cwd=upstream)
+
+    count = options["plugins"]
+    declarations = []
+    for i in range(count):
+        name = f"plugin-{i:03d}"
+        _git(["clone", "-q", upstream, name], cwd=plugged)
+        # 保留一个未声明的插件，并制造落后上游和工作区修改的插件；
+        # 这些只产生清点标记，不影响诊断结果是否成功
+        if i != count - 1:
+            declarations.append(f"Plug 'bench/{name}'")
+        if i % 10 == 1:
+            _git(["reset", "-q", "--hard", "HEAD~1"], cwd=os.path.join(plugged, name))
+        if i % 10 == 2:
+            with open(os.path.join(plugged, name, "plugin_0.vim"), "a", encoding="utf-8") as f:
+                f.write('" local change\n')
+    with open(os.path.join(config_dir, "init.vim"), "w", encoding="utf-8") as f:
+        f.write("call plug#begin()\n" + "\n".join(declarations) + "\ncall plug#end()\n")
+    return {"home": home}
+
+
+# ---------------------------------------------------------------- 场景执行
+
+def _patch_requests(stub: str) -> None:
+    import requests
+
+    original_get = requests.get
+
+    def local_get(url, *args, **kwargs):
+        return original_get(url.replace(WTTR_URL, stub, 1), *args, **kwargs)
+
+    requests.get = local_get
+
+
+def _run_convert_video(context: Dict[str, Any]) -> Dict[str, Any]:
+    from convert_video import convert_video
+
+    if os.path.exists(context["output_file"]):
+        os.remove(context["output_file"])
+    return convert_video().execute({
+        "input_file": context["input_file"], "output_file": context["output_file"]
+    })
+
+
+def _run_get_weather(context: Dict[str, Any]) -> Dict[str, Any]:
+    from get_weather import get_weather
+
+    _patch_requests(context["stub"])
+    return get_weather().execute({"city": "Bench", "forecast_type": "tomorrow"})
+
+
+def _run_get_weather_forecast(context: Dict[str, Any]) -> Dict[str, Any]:
+    from get_weather_forecast import get_weather_forecast
+
+    _patch_requests(context["stub"])
+    return get_weather_forecast().execute({"city": "Bench"})
+
+
+def _run_install_nerd_font(context: Dict[str, Any]) -> Dict[str, Any]:
+    import install_nerd_font as module
+
+    stub = context["stub"]
+    original_run = module.run_command
+
+    def local_run(args, *rest, **kwargs):
+        if isinstance(args, list):
+            args = [arg.replace(NERD_FONT_URL, stub, 1) for arg in args]
+        return original_run(args, *rest, **kwargs)
+
+    module.run_command = local_run
+    return module.install_nerd_font().execute({"font_name": "FiraCode"})
+
+
+def _run_git_code_stats(context: Dict[str, Any]) -> Dict[str, Any]:
+    from git_code_stats import git_code_stats
+
+    return git_code_stats().execute({
+        "start_date": "2023-01-01", "end_date": "2023-12-31",
+        "repo_path": context["repo"], "file_types": "py",
+    })
+
+
+def _run_nvim_diagnostic(context: Dict[str, Any]) -> Dict[str, Any]:
+    from nvim_diagnostic import nvim_diagnostic
+
+    return nvim_diagnostic().execute({"plugin_inventory": True})
+
+
+# 场景名 -> (所需二进制, 所需Python模块, 准备函数, 执行函数, 是否需要HTTP桩)
+SCENARIOS: Dict[str, Any] = {
+    "convert_video": (["ffmpeg"], [], _prepare_convert_video, _run_convert_video, False),
+    "get_weather": ([], ["requests"], _prepare_home, _run_get_weather, True),
+    "get_weather_forecast": ([], ["requests"], _prepare_home, _run_get_weather_forecast, True),
+    "install_nerd_font": (["wget|curl", "unzip", "fc-cache", "fc-list"], [],
+                          _prepare_home, _run_install_nerd_font, True),
+    "git_code_stats": (["git", "loc"], ["dateutil"], _prepare_git_code_stats, _run_git_code_stats, False),
+    "nvim_diagnostic": (["git", "nvim"], [], _prepare_nvim_diagnostic, _run_nvim_diagnostic, False),
+}
+
+
+def _missing_requirements(binaries: List[str], modules: List[str]) -> List[str]:
+    missing = [b for b in binaries if not any(find_binary(alt) for alt in b.split("|"))]
+    missing += [m for m in modules if not probe_module(m)]
+    return missing
+
+
+def _peak_rss_kb() -> int:
+    """
+    当前进程的峰值RSS
+
+    Linux上 ru_maxrss 会继承fork时父进程的峰值，优先读取exec后重新计数的VmHWM。
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 以字节为单位，Linux 以KB为单位
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _run_scenario_in_process(name: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    """子进程入口：执行单个场景并返回测量结果"""
+    run_fn, needs_stub = SCENARIOS[name][3], SCENARIOS[name][4]
+    server = _start_stub() if needs_stub else None
+    if server is not None:
+        context = dict(context, stub=_stub_url(server))
+    reset_metrics()
+    try:
+        start = time.perf_counter()
+        result = run_fn(context)
+        wall_time = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.shutdown()
+    commands = get_metrics()
+    return {
+        "success": bool(result.get("success")),
+        "wall_time_s": round(wall_time, 6),
+        "peak_rss_kb": _peak_rss_kb(),
+        "subprocess_count": len(commands),
+        "subprocess_cpu_time_s": round(sum(c["cpu_time_s"] or 0 for c in commands), 6),
+        "subprocess_peak_rss_kb": max((c["max_rss_kb"] or 0 for c in commands), default=0),
+    }
+
+
+def run_benchmarks(names: List[str], repeat: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """为每个场景准备替身环境，并在独立子进程中重复执行"""
+    report: Dict[str, Any] = {}
+    for name in names:
+        binaries, modules, prepare_fn = SCENARIOS[name][:3]
+        missing = _missing_requirements(binaries, modules)
+        if missing:
+            report[name] = {"skipped": f"missing: {', '.join(missing)}"}
+            continue
+        workdir = tempfile.mkdtemp(prefix=f"jarvis-bench-{name}-")
+        try:
+            context = prepare_fn(workdir, options)
+            env = dict(os.environ)
+            if "home" in context:
+                # nvim优先读取XDG目录，与工具中按HOME展开的路径保持一致
+                env["HOME"] = context["home"]
+                env["XDG_CONFIG_HOME"] = os.path.join(context["home"], ".config")
+                env["XDG_DATA_HOME"] = os.path.join(context["home"], ".local", "share")
+            runs = []
+            for _ in range(repeat):
+                proc = run_command(
+                    [sys.executable, os.path.abspath(__file__), "--run-scenario", name,
+                     "--context", json.dumps(context)],
+                    env=env, timeout=SCENARIO_TIMEOUT
+                )
+                lines = proc.stdout.strip().splitlines()
+                if proc.returncode != 0 or not lines:
+                    stderr = proc.stderr.strip().splitlines()
+                    raise RuntimeError(stderr[-1] if stderr else f"exit code {proc.returncode}")
+                runs.append(json.loads(lines[-1]))
+            report[name] = {
+                "success": all(r["success"] for r in runs),
+                "runs": len(runs),
+                "wall_time_s": round(statistics.median(r["wall_time_s"] for r in runs), 6),
+                "wall_time_min_s": min(r["wall_time_s"] for r in runs),
+                "peak_rss_kb": max(r["peak_rss_kb"] for r in runs),
+                "subprocess_count": max(r["subprocess_count"] for r in runs),
+                "subprocess_cpu_time_s": round(statistics.median(r["subprocess_cpu_time_s"] for r in runs), 6),
+                "subprocess_peak_rss_kb": max(r["subprocess_peak_rss_kb"] for r in runs),
+            }
+        except Exception as e:
+            report[name] = {"error": str(e)}
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+    """
+    按墙钟时间、峰值RSS（自身与子进程）和子进程数与基线比较，超过阈值的记为回退
+
+    基线中有测量结果、本次却出错或被跳过的场景同样记为回退。
+    """
+    comparison: Dict[str, Any] = {}
+    for name, current in report.items():
+        base = baseline.get(name)
+        if not base or "wall_time_s" not in base:
+            continue
+        if "wall_time_s" not in current:
+            status = current.get("error") or current.get("skipped") or "no result"
+            comparison[name] = {"regressions": ["status"], "status": status}
+            continue
+        entry: Dict[str, Any] = {"regressions": []}
+        if base.get("success") and not current.get("success"):
+            entry["regressions"].append("success")
+        for key in ("wall_time_s", "peak_rss_kb", "subprocess_peak_rss_kb", "subprocess_count"):
+            if not base.get(key):
+                continue
+            ratio = current[key] / base[key]
+            entry[key] = {"baseline": base[key], "current": current[key], "ratio": round(ratio, 3)}
+            if ratio > threshold:
+                entry["regressions"].append(key)
+        comparison[name] = entry
+    return comparison
+
+
+def measure_tool_startup(use_cache: bool, legacy: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    在独立子进程中逐个导入工具并调用 check()，返回每个工具的耗时
+
+    legacy为True时不调用 check()，而是按 LEGACY_STARTUP 重放改造前的顶层导入和子进程探测。
+    """
+    env = dict(os.environ)
+    env[CACHE_ENV] = "1" if use_cache else "0"
+    results: Dict[str, Dict[str, Any]] = {}
+    for tool in TOOL_MODULES:
+        command = [sys.executable, "-c", _STARTUP_SCRIPT, TOOL_DIR, tool]
+        if legacy:
+            command.append(json.dumps(LEGACY_STARTUP[tool]))
+        proc = run_command(command, env=env, timeout=STARTUP_TIMEOUT)
+        lines = proc.stdout.strip().splitlines()
+        if proc.returncode == 0 and lines:
+            results[tool] = json.loads(lines[-1])
+        else:
+            stderr = proc.stderr.strip().splitlines()
+            results[tool] = {"error": stderr[-1] if stderr else f"exit code {proc.returncode}"}
+    return results
+
+
+def run_startup() -> Dict[str, Any]:
+    """测量改造前后加载全部工具的耗时；任一组出错的工具从所有合计中剔除，保证可比"""
+    runs = {"legacy": measure_tool_startup(use_cache=False, legacy=True),
+            "uncached": measure_tool_startup(use_cache=False)}
+    # 先预热一次缓存，再测量命中缓存时的开销
+    measure_tool_startup(use_cache=True)
+    runs["cached"] = measure_tool_startup(use_cache=True)
+
+    excluded: Dict[str, Dict[str, str]] = {}
+    for label, results in runs.items():
+        for tool, record in results.items():
+            if "error" in record:
+                excluded.setdefault(tool, {})[label] = record["error"]
+    report: Dict[str, Any] = {}
+    for label, results in runs.items():
+        total = sum(r["import_s"] + r["check_s"] for tool, r in results.items() if tool not in excluded)
+        report[label] = {"total_s": round(total, 4), "tools": results}
+    report["excluded"] = excluded
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="jarvis工具离线基准测试")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="只运行指定场景，可重复指定")
+    parser.add_argument("-n", "--repeat", type=int, default=DEFAULT_REPEAT, help="每个场景的运行次数")
+    parser.add_argument("--plugins", type=int, default=DEFAULT_PLUGIN_COUNT,
+                        help="nvim_diagnostic场景中伪造的插件数量")
+    parser.add_argument("-o", "--output", help="将结果写入文件")
+    parser.add_argument("--save-baseline", help="将本次结果保存为基线文件")
+    parser.add_argument("--baseline", help="与指定基线文件比较")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="相对基线超过该倍数即视为性能回退")
+    parser.add_argument("--startup", action="store_true",
+                        help="测量加载全部工具（导入 + check()）的耗时，而不是运行场景")
+    parser.add_argument("--run-scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--context", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_scenario:
+        print(json.dumps(_run_scenario_in_process(args.run_scenario, json.loads(args.context))))
+        return 0
+
+    if args.startup:
+        data = json.dumps({"startup": run_startup()}, indent=2, ensure_ascii=False)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(data)
+        print(data)
+        return 0
+
+    names = args.scenario or list(SCENARIOS)
+    report = run_benchmarks(names, max(1, args.repeat), {"plugins": args.plugins})
+    output: Dict[str, Any] = {"scenarios": report}
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("scenarios", {})
+        comparison = compare_with_baseline(report, baseline, args.threshold)
+        output["comparison"] = comparison
+        if any(entry["regressions"] for entry in comparison.values()):
+            exit_code = 1
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"scenarios": report}, f, indent=2, ensure_ascii=False)
+
+    data = json.dumps(output, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data)
+    print(data)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@ import os
 import subprocess
 from typing import Dict, Any
 from jarvis.jarvis_utils.output import PrettyOutput, OutputType
+from tool_probe import probe_binary
+from tool_runner import run_command
 
 class convert_video:
     """
@@ -28,12 +30,10 @@ class convert_video:
     @staticmethod
     def check() -> bool:
         """检查ffmpeg是否已安装"""
-        try:
-            subprocess.run(["ffmpeg", "-version"], check=True, capture_output=True, text=True)
+        if probe_binary("ffmpeg", ("-version",)):
             return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            PrettyOutput.print("错误：ffmpeg未安装或不在系统PATH中。", OutputType.ERROR)
-            return False
+        PrettyOutput.print("错误：ffmpeg未安装或不在系统PATH中。", OutputType.ERROR)
+        return False
 
     def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """执行视频转换"""
@@ -53,7 +53,7 @@ class convert_video:
 
         try:
             PrettyOutput.print(f"正在执行转换命令: {' '.join(command)}", OutputType.INFO)
-            process = subprocess.run(command, check=True, capture_output=True, text=True)
+            process = run_command(command, check=True)
             success_message = f"视频已成功转换为 {output_file}"
             PrettyOutput.print(success_message, OutputType.SUCCESS)
             return {
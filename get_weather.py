@@ -1,8 +1,8 @@
 # -*- coding: utf-8 -*-
-import requests
 from typing import Dict, Any
 
 from jarvis.jarvis_utils.output import PrettyOutput, OutputType
+from tool_probe import probe_module
 
 class get_weather:
     name = "get_weather"
@@ -39,14 +39,14 @@ class get_weather:
     @staticmethod
     def check() -> bool:
         """检查requests库是否可用"""
-        try:
-            import requests
+        if probe_module("requests"):
             return True
-        except ImportError:
-            PrettyOutput.print("缺少 'requests' 库，请先安装: pip install requests", OutputType.ERROR)
-            return False
+        PrettyOutput.print("缺少 'requests' 库，请先安装: pip install requests", OutputType.ERROR)
+        return False
 
     def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        import requests
+
         city = args.get("city")
         forecast_type = args.get("forecast_type", "tomorrow")
 
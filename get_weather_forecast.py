@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
-import requests
 from typing import Dict, Any
 from jarvis.jarvis_utils.output import PrettyOutput, OutputType
+from tool_probe import probe_module
 import json
 
 class get_weather_forecast:
@@ -24,14 +24,14 @@ class get_weather_forecast:
     @staticmethod
     def check() -> bool:
         # 检查requests库是否存在
-        try:
-            import requests
+        if probe_module("requests"):
             return True
-        except ImportError:
-            PrettyOutput.print("缺少 'requests' 库，请先安装: pip install requests", OutputType.ERROR)
-            return False
+        PrettyOutput.print("缺少 'requests' 库，请先安装: pip install requests", OutputType.ERROR)
+        return False
 
     def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        import requests
+
         city = args.get("city")
         if not city:
             return {
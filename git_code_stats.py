@@ -3,9 +3,10 @@ import os
 import subprocess
 import tempfile
 from datetime import datetime
-from dateutil.relativedelta import relativedelta
 from typing import Dict, Any
 from jarvis.jarvis_utils.output import PrettyOutput, OutputType
+from tool_probe import probe_binary
+from tool_runner import run_command
 
 class git_code_stats:
     name = "git_code_stats"
@@ -37,18 +38,17 @@ class git_code_stats:
     @staticmethod
     def check() -> bool:
         """Checks if git and loc are installed."""
-        try:
-            subprocess.run(["git", "--version"], check=True, capture_output=True)
-            subprocess.run(["loc", "--version"], check=True, capture_output=True)
+        if probe_binary("git") and probe_binary("loc"):
             return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            PrettyOutput.print("Error: 'git' and 'loc' command-line tools are required.", OutputType.ERROR)
-            return False
+        PrettyOutput.print("Error: 'git' and 'loc' command-line tools are required.", OutputType.ERROR)
+        return False
 
-    def _run_command(self, command, cwd):
-        return subprocess.run(command, check=True, capture_output=True, text=True, cwd=cwd)
+    def _run_command(self, command, cwd, timeout=60):
+        return run_command(command, check=True, cwd=cwd, timeout=timeout)
 
     def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        from dateutil.relativedelta import relativedelta
+
         start_date_str = args["start_date"]
         end_date_str = args["end_date"]
         repo_path = args.get("repo_path", ".")
@@ -96,7 +96,7 @@ class git_code_stats:
                         
                         # Run loc and save output
                         loc_command = ["loc", f"--include={file_types}", "."]
-                        loc_result = self._run_command(loc_command, cwd=repo_path)
+                        loc_result = self._run_command(loc_command, cwd=repo_path, timeout=600)
                         temp_f.write(loc_result.stdout)
                         temp_f.seek(0)
                         
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 from typing import Dict, Any
 from jarvis.jarvis_utils.output import PrettyOutput, OutputType
+from tool_probe import find_binary
+from tool_runner import run_command
 import os
-import subprocess
 import tempfile
 import shutil
 
@@ -29,19 +30,12 @@ class install_nerd_font:
     @staticmethod
     def check() -> bool:
         """检查系统是否支持字体安装"""
-        try:
-            # 检查是否有wget或curl
-            result = subprocess.run(['which', 'wget'], capture_output=True, text=True)
-            if result.returncode != 0:
-                result = subprocess.run(['which', 'curl'], capture_output=True, text=True)
-                if result.returncode != 0:
-                    return False
-            
-            # 检查fc-cache命令是否存在
-            result = subprocess.run(['which', 'fc-cache'], capture_output=True, text=True)
-            return result.returncode == 0
-        except:
+        # 检查是否有wget或curl
+        if not (find_binary('wget') or find_binary('curl')):
             return False
+        
+        # 检查fc-cache命令是否存在
+        return find_binary('fc-cache') is not None
     
     def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """执行字体安装"""
@@ -62,12 +56,12 @@ class install_nerd_font:
                 # 下载字体文件
                 PrettyOutput.print(f"正在下载 {font_name} Nerd Font...", OutputType.INFO)
                 download_cmd = ['wget', '-q', font_url, '-O', zip_path]
-                result = subprocess.run(download_cmd, capture_output=True, text=True)
+                result = run_command(download_cmd, timeout=300)
                 
                 if result.returncode != 0:
                     # 尝试使用curl作为备选
                     download_cmd = ['curl', '-L', '-s', font_url, '-o', zip_path]
-                    result = subprocess.run(download_cmd, capture_output=True, text=True)
+                    result = run_command(download_cmd, timeout=300)
                     
                     if result.returncode != 0:
                         PrettyOutput.print(f"下载失败，请检查字体名称和版本是否正确", OutputType.ERROR)
@@ -80,7 +74,7 @@ class install_nerd_font:
                 # 解压字体文件
                 PrettyOutput.print("正在解压字体文件...", OutputType.INFO)
                 unzip_cmd = ['unzip', '-q', zip_path, '-d', temp_dir]
-                result = subprocess.run(unzip_cmd, capture_output=True, text=True)
+                result = run_command(unzip_cmd, timeout=120)
                 
                 if result.returncode != 0:
                     PrettyOutput.print("解压失败", OutputType.ERROR)
@@ -106,16 +100,21 @@ class install_nerd_font:
                 # 更新字体缓存
                 PrettyOutput.print("正在更新字体缓存...", OutputType.INFO)
                 cache_cmd = ['fc-cache', '-fv', font_dir]
-                result = subprocess.run(cache_cmd, capture_output=True, text=True)
+                result = run_command(cache_cmd, timeout=120, max_output=64 * 1024)
                 
                 if result.returncode != 0:
                     PrettyOutput.print("字体缓存更新失败", OutputType.WARNING)
             
             # 验证安装
-            verify_cmd = ['fc-list', '|', 'grep', '-i', font_name.lower()]
-            result = subprocess.run(' '.join(verify_cmd), shell=True, capture_output=True, text=True)
+            matched_fonts = []
+            
+            def collect_match(line):
+                if font_name.lower() in line.lower():
+                    matched_fonts.append(line.strip())
+            
+            run_command(['fc-list'], timeout=30, max_output=64 * 1024, stdout_consumer=collect_match)
             
-            if result.stdout.strip():
+            if matched_fonts:
                 PrettyOutput.print(f"{font_name} Nerd Font 安装成功！", OutputType.SUCCESS)
                 return {
                     "success": True,
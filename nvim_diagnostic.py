@@ -1,8 +1,274 @@
 # -*- coding: utf-8 -*-
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import os
+import re
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from jarvis.jarvis_utils.output import PrettyOutput, OutputType
+from tool_probe import probe_binary
+from tool_runner import run_command
+
+# 插件清点时的并发上限，避免大量插件时一次性启动过多git进程
+INVENTORY_MAX_WORKERS = 16
+# 超过该天数未fetch的插件视为过期
+STALE_FETCH_DAYS = 180
+# 超过该大小的插件视为体积过大
+LARGE_PLUGIN_BYTES = 50 * 1024 * 1024
+
+_PLUG_DECL_RE = re.compile(r"""^\s*Plug\s+['"]([^'"]+)['"](.*)$""")
+_PLUG_AS_RE = re.compile(r"""['"]as['"]\s*:\s*['"]([^'"]+)['"]""")
+_PLUG_DIR_RE = re.compile(r"""['"]dir['"]\s*:\s*['"]([^'"]+)['"]""")
+
+def _resolve_git_dir(plugin_path: str) -> Optional[str]:
+    """定位插件的git目录，兼容 .git 为 "gitdir: ..." 文件的情况"""
+    dot_git = os.path.join(plugin_path, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        with open(dot_git, "r", encoding="utf-8") as f:
+            content = f.read().strip()
+    except OSError:
+        return None
+    if not content.startswith("gitdir:"):
+        return None
+    git_dir = content[len("gitdir:"):].strip()
+    if not os.path.isabs(git_dir):
+        git_dir = os.path.normpath(os.path.join(plugin_path, git_dir))
+    return git_dir if os.path.isdir(git_dir) else None
+
+
+def _common_git_dir(git_dir: str) -> str:
+    """worktree场景下refs和config存放在commondir中"""
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r", encoding="utf-8") as f:
+            common = f.read().strip()
+    except OSError:
+        return git_dir
+    return os.path.normpath(os.path.join(git_dir, common))
+
+
+def _read_ref(git_dir: str, common_dir: str, ref: str) -> Optional[str]:
+    """直接读取loose ref或packed-refs得到提交哈希，不启动git进程"""
+    for base in (git_dir, common_dir):
+        try:
+            with open(os.path.join(base, ref), "r", encoding="utf-8") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.startswith("ref:"):
+            return _read_ref(git_dir, common_dir, value[4:].strip())
+        return value or None
+    try:
+        with open(os.path.join(common_dir, "packed-refs"), "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return None
+
+
+def _read_head(git_dir: str, common_dir: str) -> Tuple[Optional[str], Optional[str]]:
+    """返回 (分支名, HEAD提交哈希)，分离HEAD时分支名为None"""
+    try:
+        with open(os.path.join(git_dir, "HEAD"), "r", encoding="utf-8") as f:
+            head = f.read().strip()
+    except OSError:
+        return None, None
+    if head.startswith("ref:"):
+        ref = head[4:].strip()
+        branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+        return branch, _read_ref(git_dir, common_dir, ref)
+    return None, head or None
+
+
+def _read_upstream_ref(common_dir: str, branch: str) -> Optional[str]:
+    """从 .git/config 中解析分支的上游跟踪引用，如 refs/remotes/origin/master"""
+    remote = merge = None
+    in_section = False
+    try:
+        with open(os.path.join(common_dir, "config"), "r", encoding="utf-8") as f:
+            for raw in f:
+                line = raw.strip()
+                if line.startswith("["):
+                    in_section = line == f'[branch "{branch}"]'
+                    continue
+                if not in_section or "=" not in line:
+                    continue
+                key, value = (part.strip() for part in line.split("=", 1))
+                if key == "remote":
+                    remote = value
+                elif key == "merge":
+                    merge = value
+    except OSError:
+        return None
+    if not remote or not merge:
+        return None
+    if remote == ".":
+        return merge
+    if merge.startswith("refs/heads/"):
+        merge = merge[len("refs/heads/"):]
+    return f"refs/remotes/{remote}/{merge}"
+
+
+def _dir_size(path: str) -> int:
+    """使用os.scandir迭代统计目录占用，不跟随符号链接"""
+    total = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def _parse_plug_declarations(config_path: str) -> Dict[str, Optional[str]]:
+    """
+    解析init.vim中的Plug声明，返回 {插件名: 安装位置}
+
+    本地路径插件（Plug '~/foo'）和指定了 'dir' 的插件不在plugged目录中，
+    安装位置为其实际路径；其余插件为None，表示安装在plugged目录下。
+    """
+    declared: Dict[str, Optional[str]] = {}
+    try:
+        with open(config_path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                match = _PLUG_DECL_RE.match(line)
+                if not match:
+                    continue
+                spec, options = match.group(1), match.group(2)
+                alias = _PLUG_AS_RE.search(options)
+                if alias:
+                    name = alias.group(1)
+                else:
+                    name = spec.rstrip("/").split("/")[-1]
+                    if name.endswith(".git"):
+                        name = name[:-4]
+                custom_dir = _PLUG_DIR_RE.search(options)
+                if custom_dir:
+                    location = os.path.expanduser(os.path.expandvars(custom_dir.group(1)))
+                elif spec.startswith(("~", "/", "$")):
+                    location = os.path.expanduser(os.path.expandvars(spec))
+                else:
+                    location = None
+                declared[name] = location
+    except OSError:
+        pass
+    return declared
+
+
+def _inspect_plugin(name: str, path: str) -> Dict[str, Any]:
+    """检查单个插件的git状态和磁盘占用，只在必要时启动git"""
+    info: Dict[str, Any] = {
+        "name": name,
+        "path": path,
+        "branch": None,
+        "head": None,
+        "upstream": None,
+        "ahead": None,
+        "behind": None,
+        "dirty": None,
+        "fetch_age_days": None,
+        "size_bytes": _dir_size(path),
+    }
+    git_dir = _resolve_git_dir(path)
+    if git_dir is None:
+        return info
+    common_dir = _common_git_dir(git_dir)
+    branch, head = _read_head(git_dir, common_dir)
+    info["branch"] = branch
+    info["head"] = head
+
+    try:
+        fetch_mtime = os.stat(os.path.join(git_dir, "FETCH_HEAD")).st_mtime
+        info["fetch_age_days"] = int((time.time() - fetch_mtime) // 86400)
+    except OSError:
+        pass
+
+    upstream_ref = _read_upstream_ref(common_dir, branch) if branch else None
+    upstream = _read_ref(git_dir, common_dir, upstream_ref) if upstream_ref else None
+    if upstream_ref:
+        info["upstream"] = upstream_ref
+    if head and upstream:
+        if head == upstream:
+            info["ahead"], info["behind"] = 0, 0
+        else:
+            try:
+                result = run_command(
+                    ["git", "-C", path, "rev-list", "--left-right", "--count", f"{head}...{upstream}"],
+                    timeout=10
+                )
+                if result.returncode == 0:
+                    ahead, behind = result.stdout.split()
+                    info["ahead"], info["behind"] = int(ahead), int(behind)
+            except (subprocess.SubprocessError, OSError, ValueError):
+                pass
+
+    try:
+        result = run_command(
+            ["git", "--no-optional-locks", "-C", path, "status", "--porcelain", "--untracked-files=no"],
+            timeout=10, max_output=4096
+        )
+        if result.returncode == 0:
+            info["dirty"] = bool(result.stdout.strip())
+    except (subprocess.SubprocessError, OSError):
+        pass
+    return info
+
+
+def _scan_plugins(plugged_dir: str, config_path: str) -> Dict[str, Any]:
+    """清点插件目录：os.scandir列举，线程池并发检查，并与Plug声明对照"""
+    with os.scandir(plugged_dir) as it:
+        entries = sorted(
+            (entry.name, entry.path) for entry in it
+            if not entry.name.startswith(".") and entry.is_dir()
+        )
+    declared = _parse_plug_declarations(config_path)
+
+    plugins: List[Dict[str, Any]] = []
+    if entries:
+        workers = min(INVENTORY_MAX_WORKERS, len(entries))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            plugins = list(executor.map(lambda e: _inspect_plugin(*e), entries))
+
+    for plugin in plugins:
+        flags = []
+        plugin["declared"] = plugin["name"] in declared
+        if declared and not plugin["declared"]:
+            flags.append("orphaned")
+        if plugin["head"] is None:
+            flags.append("no-git")
+        if plugin["dirty"]:
+            flags.append("dirty")
+        if plugin["behind"]:
+            flags.append("stale")
+        elif plugin["fetch_age_days"] is not None and plugin["fetch_age_days"] > STALE_FETCH_DAYS:
+            flags.append("stale")
+        if plugin["size_bytes"] > LARGE_PLUGIN_BYTES:
+            flags.append("large")
+        plugin["flags"] = flags
+
+    installed = {plugin["name"] for plugin in plugins}
+    missing = sorted(
+        name for name, location in declared.items()
+        if (not os.path.isdir(location) if location else name not in installed)
+    )
+    return {"plugins": plugins, "missing": missing}
+
 
 class nvim_diagnostic:
     name = "nvim_diagnostic"
@@ -21,6 +287,11 @@ class nvim_diagnostic:
                 "description": "是否检查插件管理器状态",
                 "default": True
             },
+            "plugin_inventory": {
+                "type": "boolean",
+                "description": "是否清点已安装插件（git状态、与上游的差距、磁盘占用，并与init.vim中的Plug声明对照）",
+                "default": False
+            },
             "verbose": {
                 "type": "boolean",
                 "description": "是否显示详细检查信息",
@@ -33,11 +304,7 @@ class nvim_diagnostic:
     @staticmethod
     def check() -> bool:
         """检查是否安装了nvim"""
-        try:
-            subprocess.run(["nvim", "--version"], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+        return probe_binary("nvim")
     
     def execute(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """执行nvim诊断"""
@@ -46,6 +313,8 @@ class nvim_diagnostic:
             
             issues_found = []
             fixes_applied = []
+            inventory = None
+            inventory_lines = []
             
             # 1. 检查vim-plug
             plug_path = os.path.expanduser("~/.local/share/nvim/site/autoload/plug.vim")
@@ -94,11 +363,11 @@ class nvim_diagnostic:
             # 3. 测试nvim启动
             PrettyOutput.print("测试nvim启动...", OutputType.INFO)
             try:
-                result = subprocess.run([
+                result = run_command([
                     "nvim", "--headless", 
                     "-c", "echo 'test'", 
                     "-c", "qa!"
-                ], capture_output=True, text=True, timeout=10)
+                ], timeout=10)
                 
                 if result.returncode == 0:
                     PrettyOutput.print("nvim可以正常启动", OutputType.SUCCESS)
@@ -116,8 +385,27 @@ class nvim_diagnostic:
             if not os.path.exists(plugged_dir):
                 if args.get("verbose", False):
                     PrettyOutput.print("插件目录尚未创建", OutputType.INFO)
+            elif args.get("plugin_inventory", False):
+                scan_start = time.perf_counter()
+                inventory = _scan_plugins(plugged_dir, config_path)
+                scan_elapsed = time.perf_counter() - scan_start
+                PrettyOutput.print(
+                    f"已安装 {len(inventory['plugins'])} 个插件，清点耗时 {scan_elapsed:.3f}s",
+                    OutputType.INFO
+                )
+                for plugin in inventory["plugins"]:
+                    if plugin["flags"]:
+                        inventory_lines.append(f"{plugin['name']}: {', '.join(plugin['flags'])}")
+                    elif args.get("verbose", False):
+                        inventory_lines.append(f"{plugin['name']}: ok")
+                for name in inventory["missing"]:
+                    inventory_lines.append(f"{name}: missing")
+                    issues_found.append(f"插件 {name} 已在init.vim中声明但未安装")
+                for line in inventory_lines:
+                    PrettyOutput.print(f"  {line}", OutputType.INFO)
             else:
-                plugin_count = len([d for d in os.listdir(plugged_dir) if os.path.isdir(os.path.join(plugged_dir, d))])
+                with os.scandir(plugged_dir) as it:
+                    plugin_count = sum(1 for entry in it if entry.is_dir())
                 PrettyOutput.print(f"已安装 {plugin_count} 个插件", OutputType.INFO)
             
             # 输出总结
@@ -136,14 +424,19 @@ class nvim_diagnostic:
             stdout_msg = f"诊断完成。发现问题: {len(issues_found)}个, 修复应用: {len(fixes_applied)}个"
             if args.get("verbose", False) and issues_found:
                 stdout_msg += "\n问题详情:\n" + "\n".join(f"- {issue}" for issue in issues_found)
+            if inventory_lines:
+                stdout_msg += "\n插件清点:\n" + "\n".join(f"- {line}" for line in inventory_lines)
             
-            return {
+            output = {
                 "success": len(issues_found) == 0 or (args.get("fix_issues", False) and len(issues_found) == len(fixes_applied)),
                 "stdout": stdout_msg,
                 "stderr": "",
                 "issues_found": issues_found,
                 "fixes_applied": fixes_applied
             }
+            if inventory is not None:
+                output["plugin_inventory"] = inventory
+            return output
             
         except Exception as e:
             PrettyOutput.print(f"诊断过程出错: {str(e)}", OutputType.ERROR)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+工具可用性探测缓存
+
+各工具的 check() 不再每次都启动子进程，而是通过本模块探测：
+- 二进制：先用 shutil.which 解析路径，以 (路径, 参数) 作为键、以链接目标的
+  mtime/inode 校验有效性，可用的结果持久化到 ~/.cache/jarvis-tools/probe_cache.json，
+  跨进程复用；二进制被升级或替换后 mtime/inode 变化，缓存自动失效。
+  探测失败的结果只在当前进程内记住，不写入磁盘，避免一次偶发失败永久禁用工具。
+- Python模块：使用 importlib.util.find_spec 判断，不真正导入。
+
+设置环境变量 JARVIS_TOOLS_PROBE_CACHE=0 可禁用持久化缓存。
+加载全部工具的耗时可用 `python bench/tool_benchmark.py --startup` 测量。
+"""
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+from tool_runner import run_command
+
+PROBE_TIMEOUT = 10
+CACHE_ENV = "JARVIS_TOOLS_PROBE_CACHE"
+
+_lock = threading.Lock()
+_memory: Dict[str, Dict[str, Any]] = {}
+
+
+def cache_enabled() -> bool:
+    return os.environ.get(CACHE_ENV, "1") != "0"
+
+
+def cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "jarvis-tools", "probe_cache.json")
+
+
+def _load_cache() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(cache_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_entry(key: str, entry: Dict[str, Any]) -> None:
+    """合并写入缓存文件，使用临时文件 + os.replace 保证并发进程下文件完整"""
+    path = cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = _load_cache()
+        data[key] = entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".probe_cache.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        # 缓存只是加速手段，写入失败不影响探测结果
+        pass
+
+
+def find_binary(name: str) -> Optional[str]:
+    """在PATH中查找可执行文件，不启动子进程"""
+    return shutil.which(name)
+
+
+def probe_binary(name: str, args: Sequence[str] = ("--version",)) -> bool:
+    """
+    判断二进制是否可用（存在且 `name *args` 以0退出）
+
+    结果按 (PATH中的路径, 参数) 缓存，并以链接目标的 mtime/inode 校验有效性。
+    执行时使用PATH中的路径而非链接目标，以兼容按argv[0]分派的多调用二进制
+    （busybox、snap应用等）。
+    """
+    resolved = find_binary(name)
+    if resolved is None:
+        return False
+    try:
+        st = os.stat(resolved)
+    except OSError:
+        return False
+
+    key = f"{resolved}\0{' '.join(args)}"
+    use_cache = cache_enabled()
+    with _lock:
+        entry = _memory.get(key)
+        if entry is None and use_cache:
+            entry = _load_cache().get(key)
+        if entry and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("ino") == st.st_ino:
+            _memory[key] = entry
+            return bool(entry.get("available"))
+
+    try:
+        run_command([resolved, *args], check=True, timeout=PROBE_TIMEOUT, max_output=4096)
+        available = True
+    except (subprocess.SubprocessError, OSError):
+        available = False
+
+    entry = {
+        "path": resolved,
+        "target": os.path.realpath(resolved),
+        "mtime_ns": st.st_mtime_ns,
+        "ino": st.st_ino,
+        "available": available,
+    }
+    with _lock:
+        _memory[key] = entry
+        if use_cache and available:
+            _save_entry(key, entry)
+    return available
+
+
+def probe_module(name: str) -> bool:
+    """判断Python模块是否可导入，只查找不导入"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+工具共用的子进程执行器
+
+替代各工具中直接调用的 subprocess.run(..., capture_output=True)：
+- stdout/stderr 由后台线程增量读取，可按行或按字节块交给回调处理；
+- 每个流只保留最后 max_output 字节，避免大量输出全部驻留内存；
+- 子进程在独立进程组中运行，超时后整组终止（包括其派生的子进程）；
+- 每次调用的墙钟时间、CPU时间、峰值RSS和输出量记录到进程内的指标注册表，
+  可通过 dump_metrics() 导出为JSON。
+
+run_command 的返回值和异常与 subprocess.run 保持一致
+（CompletedProcess / CalledProcessError / TimeoutExpired），
+文本模式下同样将 \r\n 和 \r 转换为 \n，调用方原有的处理无需改动。
+回调抛出的异常会在子进程结束后由 run_command 重新抛出。
+"""
+import codecs
+import collections
+import json
+import locale
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_MAX_OUTPUT = 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+KILL_GRACE_PERIOD = 2.0
+MAX_METRICS = 1000
+
+Consumer = Callable[[Union[str, bytes]], None]
+
+_metrics_lock = threading.Lock()
+_metrics: Deque[Dict[str, Any]] = collections.deque(maxlen=MAX_METRICS)
+
+
+class CommandResult(subprocess.CompletedProcess):
+    """在 CompletedProcess 基础上附带本次调用的开销信息"""
+
+    def __init__(self, args, returncode, stdout, stderr, metrics: Dict[str, Any]):
+        super().__init__(args, returncode, stdout, stderr)
+        self.metrics = metrics
+        self.timed_out = metrics["timed_out"]
+        self.truncated = metrics["truncated"]
+
+
+class _StreamReader(threading.Thread):
+    """增量读取一个管道，转发给回调并保留尾部输出"""
+
+    def __init__(self, pipe, text: bool, encoding: str, max_output: int,
+                 consumer: Optional[Consumer], consume_lines: bool):
+        super().__init__(daemon=True)
+        self.pipe = pipe
+        self.text = text
+        self.encoding = encoding
+        self.decoder = codecs.getincrementaldecoder(encoding)(errors="replace") if text else None
+        self.max_output = max_output
+        self.consumer = consumer
+        self.consume_lines = consume_lines
+        self.chunks: Deque[bytes] = collections.deque()
+        self.retained = 0
+        self.total = 0
+        self.peak = 0
+        self.truncated = False
+        self.error: Optional[BaseException] = None
+        self._pending: Union[str, bytes] = "" if text else b""
+        self._carry = ""
+
+    def run(self) -> None:
+        fd = self.pipe.fileno()
+        try:
+            while True:
+                chunk = os.read(fd, READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                self._retain(chunk)
+                self._deliver(chunk, final=False)
+        except OSError:
+            pass
+        finally:
+            self._deliver(b"", final=True)
+            self.pipe.close()
+
+    def _deliver(self, chunk: bytes, final: bool) -> None:
+        """回调出错后停止转发，但继续读取管道，避免子进程因管道断开而退出"""
+        if self.consumer is None:
+            return
+        try:
+            self._forward(chunk, final)
+        except Exception as e:
+            self.error = e
+            self.consumer = None
+
+    def _retain(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        self.chunks.append(chunk)
+        self.retained += len(chunk)
+        while self.retained > self.max_output and self.chunks:
+            overflow = self.retained - self.max_output
+            head = self.chunks[0]
+            if len(head) <= overflow:
+                self.chunks.popleft()
+                self.retained -= len(head)
+            else:
+                self.chunks[0] = head[overflow:]
+                self.retained -= overflow
+            self.truncated = True
+        self.peak = max(self.peak, self.retained)
+
+    def _translate(self, data: str, final: bool) -> str:
+        """与 subprocess 的文本模式一致转换换行；末尾的 \r 留到下一块，以免拆开 \r\n"""
+        data = self._carry + data
+        self._carry = ""
+        if not final and data.endswith("\r"):
+            data, self._carry = data[:-1], "\r"
+        return data.replace("\r\n", "\n").replace("\r", "\n")
+
+    def _forward(self, chunk: bytes, final: bool) -> None:
+        if self.text:
+            data = self._translate(self.decoder.decode(chunk, final=final), final)
+        else:
+            data = chunk
+        if not self.consume_lines:
+            if data:
+                self.consumer(data)
+            return
+        newline = "\n" if self.text else b"\n"
+        parts = (self._pending + data).split(newline)
+        self._pending = parts.pop()
+        lines = [part + newline for part in parts]
+        if final and self._pending:
+            lines.append(self._pending)
+            self._pending = "" if self.text else b""
+        for line in lines:
+            self.consumer(line)
+
+    def output(self) -> Union[str, bytes]:
+        data = b"".join(self.chunks)
+        if not self.text:
+            return data
+        # 截断后开头可能落在多字节字符中间，replace即可
+        text = data.decode(self.encoding, errors="replace")
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _encoding() -> str:
+    return locale.getpreferredencoding(False)
+
+
+def _kill_group(process: subprocess.Popen) -> None:
+    """先SIGTERM整个进程组，宽限期后仍未退出则SIGKILL"""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except OSError:
+            return
+        deadline = time.monotonic() + KILL_GRACE_PERIOD
+        while time.monotonic() < deadline:
+            try:
+                os.killpg(process.pid, 0)
+            except OSError:
+                return
+            time.sleep(0.05)
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    else:
+        process.kill()
+
+
+def _wait(process: subprocess.Popen) -> Tuple[Optional[float], Optional[int]]:
+    """
+    等待进程结束，能获取rusage时返回子进程的 (CPU时间, 峰值RSS KB)
+
+    Linux上峰值RSS以fork时继承的父进程峰值为下限，子进程本身较小时反映的是调用方的内存。
+    """
+    if hasattr(os, "wait4"):
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # macOS 以字节为单位，Linux 以KB为单位
+            max_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+            return usage.ru_utime + usage.ru_stime, max_rss
+        except ChildProcessError:
+            pass
+    process.wait()
+    return None, None
+
+
+def run_command(
+    args: Union[str, Sequence[str]],
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = None,
+    check: bool = False,
+    text: bool = True,
+    shell: bool = False,
+    env: Optional[Dict[str, str]] = None,
+    max_output: int = DEFAULT_MAX_OUTPUT,
+    stdout_consumer: Optional[Consumer] = None,
+    stderr_consumer: Optional[Consumer] = None,
+    consume_lines: bool = True,
+) -> CommandResult:
+    """
+    执行命令并流式读取输出
+
+    参数与 subprocess.run 对应；stdout_consumer/stderr_consumer 会在输出到达时被调用，
+    consume_lines 为True时按行回调，否则按读取到的数据块回调。
+    超时会终止整个进程组并抛出 subprocess.TimeoutExpired。
+    """
+    encoding = _encoding()
+    started_at = time.time()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        args, cwd=cwd, env=env, shell=shell,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        start_new_session=hasattr(os, "killpg"),
+    )
+    readers = [
+        _StreamReader(process.stdout, text, encoding, max_output, stdout_consumer, consume_lines),
+        _StreamReader(process.stderr, text, encoding, max_output, stderr_consumer, consume_lines),
+    ]
+    for reader in readers:
+        reader.start()
+
+    timed_out = threading.Event()
+
+    def on_timeout() -> None:
+        timed_out.set()
+        _kill_group(process)
+
+    timer = threading.Timer(timeout, on_timeout) if timeout is not None else None
+    if timer is not None:
+        timer.daemon = True
+        timer.start()
+    try:
+        cpu_time, max_rss_kb = _wait(process)
+        # 后台子进程可能继续持有管道，所有读取线程共用同一个截止时间
+        join_deadline = time.monotonic() + KILL_GRACE_PERIOD
+        for reader in readers:
+            reader.join(max(0.0, join_deadline - time.monotonic()))
+    except BaseException:
+        # 子进程在独立会话中，收不到终端的Ctrl-C，被中断时必须主动终止
+        _kill_group(process)
+        raise
+    finally:
+        if timer is not None:
+            timer.cancel()
+    wall_time = time.perf_counter() - start
+
+    stdout, stderr = readers[0].output(), readers[1].output()
+    metrics = {
+        "command": args if isinstance(args, str) else list(args),
+        "cwd": cwd,
+        "returncode": process.returncode,
+        "started_at": started_at,
+        "wall_time_s": round(wall_time, 6),
+        "cpu_time_s": round(cpu_time, 6) if cpu_time is not None else None,
+        "max_rss_kb": max_rss_kb,
+        "stdout_bytes": readers[0].total,
+        "stderr_bytes": readers[1].total,
+        "peak_output_bytes": readers[0].peak + readers[1].peak,
+        "truncated": readers[0].truncated or readers[1].truncated,
+        "timed_out": timed_out.is_set(),
+    }
+    with _metrics_lock:
+        _metrics.append(metrics)
+
+    for reader in readers:
+        if reader.error is not None:
+            raise reader.error
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args, output=stdout, stderr=stderr)
+    return CommandResult(args, process.returncode, stdout, stderr, metrics)
+
+
+def get_metrics() -> List[Dict[str, Any]]:
+    with _metrics_lock:
+        return list(_metrics)
+
+
+def reset_metrics() -> None:
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def dump_metrics(path: Optional[str] = None) -> str:
+    """将指标导出为JSON字符串，指定path时同时写入文件"""
+    data = json.dumps(get_metrics(), indent=2, ensure_ascii=False)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+    return data